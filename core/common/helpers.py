@@ -4,11 +4,9 @@ import re
 import sh
 import sys
 import traceback
-from jsmin import jsmin
 from json import loads
 from os import execv, execvp, geteuid, makedirs, remove
 from os.path import exists, expanduser, join, split
-from six import string_types
 from termcolor import colored
 from time import gmtime, strftime
 from collections import Counter
@@ -106,7 +104,7 @@ def copy_files(src_path, dst_path, *files):
     for file in files:
         if isinstance(file, tuple):
             src, dst = file
-        elif isinstance(file, string_types):
+        elif isinstance(file, str):
             src, dst = 2 * [file]
         else:
             continue
@@ -168,7 +166,7 @@ def move_files(src_path, dst_path, *files):
     for f in files:
         if isinstance(f, tuple):
             src, dst = f
-        elif isinstance(f, string_types):
+        elif isinstance(f, str):
             src, dst = 2 * [f]
         else:
             continue
@@ -239,7 +237,7 @@ def replace_in_file(path, replacements, logger=None):
     :param logger: logger object, optional. If not none, used to output if replacement is successful
     """
     tmp = path + '.tmp'
-    if isinstance(replacements[0], string_types):
+    if isinstance(replacements[0], str):
         replacements = [replacements]
     regexs = []
     for replacement in replacements:
@@ -280,6 +278,20 @@ def replace_in_file(path, replacements, logger=None):
 
 
 # **************************************** JSON-RELATED HELPER *****************************************
+# this pattern matches string literals first so that '//' or '/*' sequences inside strings are left untouched
+__COMMENTS_REGEX = re.compile(r'("(?:\\.|[^"\\])*")|/\*.*?\*/|//[^\r\n]*', re.DOTALL)
+
+
+def __strip_comments(content):
+    """
+    This private function strips '//' and '/*...*/' comments from a JSON string, preserving string literals.
+
+    :param content: JSON string with eventual comments
+    :return: JSON string without comments
+    """
+    return __COMMENTS_REGEX.sub(lambda m: m.group(1) or '', content)
+
+
 def is_valid_commented_json(path, return_json=False, logger=None):
     """
     This function checks if the given file path is a valid commented JSON file.
@@ -292,7 +304,7 @@ def is_valid_commented_json(path, return_json=False, logger=None):
     try:
         # TODO: check JSON file structure
         with open(path) as f:
-            content = loads(jsmin(f.read()))
+            content = loads(__strip_comments(f.read()))
         return content if return_json else True
     except ValueError:
         if logger is not None:
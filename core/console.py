@@ -6,7 +6,7 @@ from funcsigs import signature
 from getpass import getuser
 from multiprocessing import cpu_count, Pool
 from signal import signal, SIGINT, SIG_IGN, SIGTERM
-from six.moves import zip_longest
+from itertools import zip_longest
 from socket import gethostname
 from subprocess import check_output, Popen, PIPE
 from sys import stdout
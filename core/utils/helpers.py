@@ -1,7 +1,6 @@
 # -*- coding: utf8 -*-
 import ast
 from os.path import join
-from six import string_types
 
 from core.conf.logconfig import logger
 
@@ -58,4 +57,4 @@ def write_config(path, config, sep=' = '):
     width = max([len(k) for k in config.keys()])
     with open(join(path, 'simulation.conf'), 'w') as f:
         for k, v in sorted(config.items(), key=lambda x: x[0]):
-            f.write('{}{}{}\n'.format(k.ljust(width), sep, ['{}', '"{}"'][isinstance(v, string_types)].format(v)))
+            f.write('{}{}{}\n'.format(k.ljust(width), sep, ['{}', '"{}"'][isinstance(v, str)].format(v)))
@@ -1,11 +1,13 @@
 # -*- coding: utf8 -*-
 from copy import deepcopy
+from functools import lru_cache
 from jinja2 import Environment, FileSystemLoader
+from json import dumps, loads
 from math import sqrt
-from os import listdir, makedirs, rename
-from os.path import basename, dirname, exists, expanduser, isdir, isfile, join, split, splitext
-from re import findall, finditer, search, sub, DOTALL, MULTILINE
-from six import string_types
+from os import close, listdir, makedirs, rename, scandir, sep, write, O_CREAT, O_TRUNC, O_WRONLY
+from os import open as os_open
+from os.path import basename, dirname, exists, expanduser, getmtime, join, split, splitext
+from re import compile as re_compile, finditer, search, sub, DOTALL, MULTILINE
 
 from core.common.helpers import *
 from core.common.wsngenerator import *
@@ -31,30 +33,57 @@ __all__ = [
 ]
 
 
+# pre-serialized JSON copies of the module-level template structures ; parsing these back with loads()
+#  yields a fresh nested copy much faster than deepcopy'ing the dictionaries on every call
+__EXPERIMENT_STRUCTURE_JSON = dumps(EXPERIMENT_STRUCTURE)
+__TEMPLATES_JSON = dumps(TEMPLATES)
+
+
 # *********************************************** GET FUNCTIONS ************************************************
+@lru_cache(maxsize=1)
+def __get_available_platforms(folder_mtime):
+    """
+    This private function lists the platforms from the Contiki directory, memoized on the folder's
+     modification time so that the filesystem is only re-scanned when the folder changes.
+
+    :param folder_mtime: modification time of the platform folder (cache key)
+    :return: List of strings representing the available platforms
+    """
+    return [entry.name for entry in scandir(join(CONTIKI_FOLDER, 'platform'))
+            if entry.is_dir(follow_symlinks=False)]
+
+
 def get_available_platforms():
     """
     This function retrieves the list of available platforms from the Contiki directory.
 
     :return: List of strings representing the available platforms
     """
-    platforms = []
-    for item in listdir(join(CONTIKI_FOLDER, 'platform')):
-        if isdir(join(CONTIKI_FOLDER, 'platform', item)):
-            platforms.append(item)
-    return platforms
+    return __get_available_platforms(getmtime(join(CONTIKI_FOLDER, 'platform')))
 
 
-def get_building_blocks():
+@lru_cache(maxsize=1)
+def __get_building_blocks(file_mtime):
     """
-    This function retrieves the list of available building blocks for the malicious mote.
+    This private function parses the building blocks JSON file, memoized on the file's modification
+     time so that the file is only re-read and re-parsed when it changes.
 
+    :param file_mtime: modification time of the building blocks file (cache key)
     :return: List of strings representing the available building blocks
     """
     return is_valid_commented_json(join(TEMPLATES_FOLDER, 'building-blocks.json'),
                                    return_json=True, logger=logger) or {}
 
 
+def get_building_blocks():
+    """
+    This function retrieves the list of available building blocks for the malicious mote.
+
+    :return: List of strings representing the available building blocks
+    """
+    return __get_building_blocks(getmtime(join(TEMPLATES_FOLDER, 'building-blocks.json')))
+
+
 def get_constants_and_replacements(blocks):
     """
     This function retrieves the constants and replacements corresponding to the building blocks provided in input.
@@ -63,22 +92,23 @@ def get_constants_and_replacements(blocks):
     :return: corresponding constants and replacements to be made in ContikiRPL files
     """
     available_blocks = get_building_blocks()
-    constants, replacements = {}, {}
+    constants, replacements, replaced_lines = {}, {}, set()
     for block in blocks:
         for key, value in available_blocks[block].items():
             # e.g. {"RPL_CONF_MIN_HOPRANKINC": 128} will be collected in constants
             if key.upper() == key and not (key.endswith('.c') or key.endswith('.h')):
-                if key in constants.keys():
+                if key in constants:
                     logger.warning(" > Building-block '{}': '{}' is already set to {}".format(block, key, value))
                 else:
                     constants[key] = value
             # else, it is a replacement in a file, e.g. {"rpl-icmp6.c": ["dag->version", "dag->version++"]}
             else:
-                if key in replacements.keys() and value[0] in [srcl for srcl, dstl in replacements.values()]:
+                if key in replacements and value[0] in replaced_lines:
                     logger.warning(" > Building-block '{}': line '{}' is already replaced in {}"
                                    .format(block, value[0], key))
                 else:
                     replacements[key] = value
+                    replaced_lines.add(value[0])
     return constants, replacements
 
 
@@ -97,21 +127,25 @@ def get_contiki_includes(target, malicious_target=None):
         files += [f.format(malicious_target) if 'platform' in f else f for f in CONTIKI_FILES]
         targets += [malicious_target]
     # separate includes and excludes based on the heading '-'
-    includes = [x for x in set(files) if not x.startswith('-')]
-    excludes = [x[1:] for x in list(set(files) - set(includes))]
+    includes, excludes = [], []
+    for x in set(files):
+        if x.startswith('-'):
+            excludes.append(x[1:])
+        else:
+            includes.append(x)
     # collect the cpu's and dev's to be included based on the target(s) to be used
     matches = {'cpu': [], 'dev': []}
+    patterns = {item: re_compile(item + r'/([a-zA-Z0-9]+)(?:\s+|/)') for item in matches}
     for target in targets:
         # search for cpu's and dev's in Makefile's for the selected target(s)
         for makefile in ['Makefile.{}'.format(target), 'Makefile.common']:
             try:
                 with open(join(CONTIKI_FOLDER, 'platform', target, makefile)) as f:
-                    for line in f.readlines():
-                        for item in matches.keys():
-                            if item in line:
-                                matches[item].extend(findall(item + r'/([a-zA-Z0-9]+)(?:\s+|/)', line))
+                    data = f.read()
             except IOError:
-                pass
+                continue
+            for item, pattern in patterns.items():
+                matches[item].extend(pattern.findall(data))
     # then, for the cpu's and dev's matched, add these to the includes
     for item in matches.keys():
         if len(matches[item]) == 0:
@@ -124,15 +158,15 @@ def get_contiki_includes(target, malicious_target=None):
     folders = {}
     for exclude in excludes:
         folder, fn = split(exclude)
-        folders.setdefault(folder, [])
-        folders[folder].append(fn)
+        folders.setdefault(folder, set()).add(fn)
     for folder, excluded_files in folders.items():
         if folder not in includes:
             continue
         includes.remove(folder)
-        for item in listdir(join(CONTIKI_FOLDER, folder)):
-            if item not in excluded_files:
-                includes.append(join(folder, item))
+        prefix = folder + sep
+        for entry in scandir(join(CONTIKI_FOLDER, folder)):
+            if entry.name not in excluded_files:
+                includes.append(prefix + entry.name)
     return includes
 
 
@@ -181,31 +215,32 @@ def get_motes_from_simulation(simfile, as_dictionary=True):
     return motes
 
 
-def get_parameter(dictionary, section, key, condition, reason=None, default=None):
+def get_parameter(parameters, section, key, condition, reason=None, default=None, silent=False):
     """
     This function checks and returns a validated value for the given parameter.
 
-    :param dictionary: dictionary of parameters
-    :param section: section in the dictionary
+    :param parameters: dictionary of parameters for the given section
+    :param section: name of the section (for logging purposes only)
     :param key: key of the related parameter
-    :param condition: validation condition
+    :param condition: validation condition ; a callable, or for list parameters either a list holding a
+                       callable to be applied per element or a set of the valid values
     :param reason: message to be displayed in case of test failure
     :param default: default value to be used in last resort
+    :param silent: specify whether the validation warnings are to be suppressed or not
     :return: validated parameter
     """
-    silent = dictionary.pop('silent', False)
-    param = (dictionary.get(section) or {}).get(key) or DEFAULTS.get(key)
+    param = parameters.get(key) or DEFAULTS.get(key)
     if param is None and default is not None:
         param = default
-    if isinstance(condition, list) and isinstance(param, list):
-        buffer = []
+    if isinstance(condition, (list, set, frozenset)) and isinstance(param, list):
+        valid = condition.__contains__ if isinstance(condition, (set, frozenset)) else condition[0]
+        buffer, rejected = [], []
         for p in param:
-            if not condition[0](p):
-                if not silent:
-                    logger.warning("Parameter [{} -> {}] '{}' does not exist (removed)"
-                                   .format(section, key, p))
-            else:
-                buffer.append(p)
+            (buffer if valid(p) else rejected).append(p)
+        if not silent:
+            for p in rejected:
+                logger.warning("Parameter [{} -> {}] '{}' does not exist (removed)"
+                               .format(section, key, p))
         return buffer
     else:
         if not condition(param):
@@ -225,8 +260,8 @@ def get_path(*args, **kwargs):
     """
     create = kwargs.get('create')
     path = expanduser(join(*args))
-    if create and not exists(path):
-        makedirs(path)
+    if create:
+        makedirs(path, exist_ok=True)
     return path
 
 
@@ -237,20 +272,27 @@ def list_campaigns():
 
     :return: list of JSON files
     """
-    return sorted([basename(f) for f in listdir(EXPERIMENT_FOLDER)
-                   if isfile(join(EXPERIMENT_FOLDER, f)) and f.endswith('.json') and
-                   is_valid_commented_json(join(EXPERIMENT_FOLDER, f))])
+    return sorted([entry.name for entry in scandir(EXPERIMENT_FOLDER)
+                   if entry.is_file() and entry.name.endswith('.json') and
+                   is_valid_commented_json(entry.path)])
+
+
+# sentinel files whose presence marks a folder as a built experiment ; testing these costs one stat
+#  per sentinel instead of the full recursive scan done by check_structure
+__EXPERIMENT_SENTINELS = (join('with-malicious', 'simulation.csc'),)
 
 
 def list_experiments(check=True):
     """
-    This function gets the list of existing experiments.
+    This function gets the list of existing experiments. Note that candidate folders are only checked
+     for sentinel files ; the full structure check is left to the code paths that repair or remove
+     experiment folders.
 
     :return: list of experiments
     """
-    return sorted([d for d in listdir(EXPERIMENT_FOLDER)
-                   if isdir(join(EXPERIMENT_FOLDER, d)) and not d.startswith('.') and (not check or
-                   check_structure(join(EXPERIMENT_FOLDER, d)))])
+    return sorted([entry.name for entry in scandir(EXPERIMENT_FOLDER)
+                   if entry.is_dir() and not entry.name.startswith('.') and (not check or
+                   all(exists(entry.path + sep + s) for s in __EXPERIMENT_SENTINELS))])
 
 
 def list_mote_types(mote_type, strip=True):
@@ -273,6 +315,25 @@ def list_wsn_gen_algorithms():
 
 
 # ************************************** TEMPLATE AND PARAMETER FUNCTIONS **************************************
+@lru_cache(maxsize=32)
+def __get_template_env(folder):
+    """
+    This private function creates a template environment for the given folder, cached so that templates
+     compiled by Jinja2 are reused across renderings instead of being rebuilt on every call. Jinja2's
+     auto-reload is kept enabled so that a template recreated with new content at the same path (e.g. the
+     mote sources copied into an experiment's templates folder on remake) is recompiled instead of being
+     served from the cache.
+
+    :param folder: templates folder path
+    :return: template environment for the given folder
+    """
+    return Environment(loader=FileSystemLoader(folder))
+
+
+# precompiled pattern for the debug flag line replaced in ContikiRPL files by apply_debug_flags
+__DEBUG_FLAG_REGEX = re_compile(r'^#define DEBUG DEBUG_[A-Z]+$', MULTILINE)
+
+
 def apply_debug_flags(contiki_rpl, debug='NONE'):
     """
     This function replaces debug flags in ContikiRPL files.
@@ -281,7 +342,11 @@ def apply_debug_flags(contiki_rpl, debug='NONE'):
     :param debug: the new value to be set for the debug flag
     """
     for filename in DEBUG_FILES:
-        replace_in_file(join(contiki_rpl, filename), (r'^#define DEBUG DEBUG_([A-Z]+)$', debug))
+        path = join(contiki_rpl, filename)
+        with open(path) as f:
+            content = f.read()
+        with open(path, 'w') as f:
+            f.write(__DEBUG_FLAG_REGEX.sub('#define DEBUG DEBUG_{}'.format(debug), content))
 
 
 def apply_replacements(contiki_rpl, replacements):
@@ -306,23 +371,26 @@ def check_structure(path, files=None, create=False, remove=False):
     :param remove: if this flag is True, non-matching files are removed
     :return: True if the file structure is respected, otherwise False
     """
-    if create and not exists(path):
-        makedirs(path)
-    files = deepcopy(EXPERIMENT_STRUCTURE) if files is None else files
+    if create:
+        makedirs(path, exist_ok=True)
+    files = loads(__EXPERIMENT_STRUCTURE_JSON) if files is None else files
     if files.get('*'):
         return True
     items = listdir(path)
     if create:
         items = [i for i, f in files.items() if not isinstance(f, bool)] + items
+    # map wildcard entries by their stem once so that matching an item is a single dict lookup instead
+    #  of formatting a '[stem].*' string per item
+    wildcards = {splitext(k)[0]: k for k in files if k.endswith('.*')}
+    prefix = path + sep
     for item in items:
-        wildcard = '{}.*'.format(splitext(item)[0])
-        match = item if item in files.keys() else (wildcard if wildcard in files.keys() else None)
+        match = item if item in files else wildcards.get(splitext(item)[0])
         if match is None:
             if remove:
                 remove_files(path, item)
             continue
         files[match] = True if isinstance(files[match], bool) else \
-            check_structure(join(path, match), deepcopy(files[match]), create, remove)
+            check_structure(prefix + match, files[match], create, remove)
     return all(files.values())
 
 
@@ -337,7 +405,7 @@ def render_campaign(exp_file):
         return [' - {}'.format(m) + ['', ' [default]'][m == DEFAULTS[a or t]] for m in list_mote_types(t)]
 
     path = dirname(exp_file)
-    write_template(path, Environment(loader=FileSystemLoader(TEMPLATES_FOLDER)), 'experiments.json',
+    write_template(path, __get_template_env(TEMPLATES_FOLDER), 'experiments.json',
                    available_building_blocks='\n'.join([' - {}'.format(b) for b in get_building_blocks()]),
                    available_root_mote_types='\n'.join(list_of('root')),
                    available_sensor_mote_types='\n'.join(list_of('sensor')),
@@ -355,8 +423,8 @@ def render_templates(path, only_malicious=False, **params):
     :param params: dictionary with all the parameters for the experiment
     :return: eventual replacements to be made in ContikiRPL files
     """
-    templates = deepcopy(TEMPLATES)
-    env = Environment(loader=FileSystemLoader(join(path, 'templates')))
+    templates = loads(__TEMPLATES_JSON)
+    env = __get_template_env(join(path, 'templates'))
     # fill in the different templates with input parameters
     constants, replacements = get_constants_and_replacements(params["blocks"])
     templates["motes/malicious.c"]["constants"] = "\n".join(["#define {} {}".format(*c) for c in constants.items()])
@@ -386,9 +454,11 @@ def render_templates(path, only_malicious=False, **params):
     templates["simulation.csc"]["motes"] = motes
     for mote_type in templates["simulation.csc"]["mote_types"]:
         mote_type["target"] = params["target"] if mote_type["name"] != "malicious" else params["malicious_target"]
-    # render the templates for the simulation with the malicious mote
+    # render the templates for the simulation with the malicious mote, keeping the rendered contents
+    #  so that templates unchanged between both simulations are not rendered twice
+    rendered = {}
     for name, kwargs in templates.items():
-        write_template(join(path, 'with-malicious'), env, name, **kwargs)
+        rendered[name] = write_template(join(path, 'with-malicious'), env, name, **kwargs)
     # now, adapt the title and mote source template
     del templates["motes/Makefile"]
     del templates["motes/root.c"]
@@ -397,9 +467,13 @@ def render_templates(path, only_malicious=False, **params):
     templates["simulation.csc"]["title"] = params["title"] + ' (without the malicious mote)'
     templates["simulation.csc"]["motes"] = motes[:-1]
     del templates["simulation.csc"]["mote_types"][-1]
-    # render the templates for the simulation without the malicious mote
+    # render the templates for the simulation without the malicious mote ; only simulation.csc was
+    #  adapted since the first pass, so the other templates are written from their rendered contents
     for name, kwargs in templates.items():
-        write_template(join(path, 'without-malicious'), env, name, **kwargs)
+        if name == "simulation.csc":
+            write_template(join(path, 'without-malicious'), env, name, **kwargs)
+        else:
+            __write_file(join(path, 'without-malicious'), name, rendered[name])
     return replacements
 
 
@@ -444,63 +518,89 @@ def validated_parameters(dictionary):
     :return: dictionary of validated parameters
     """
     params = dict(motes=dictionary.get('motes'), campaign=dictionary.get('campaign'))
+    # fetch the section sub-dictionaries and the silent flag once instead of once per parameter
+    simulation = dictionary.get("simulation") or {}
+    malicious = dictionary.get("malicious") or {}
+    silent = dictionary.get("silent", False)
     # simulation parameters
-    params["debug"] = get_parameter(dictionary, "simulation", "debug",
-                                    lambda x: isinstance(x, bool), "is not a boolean")
-    params["title"] = get_parameter(dictionary, "simulation", "title",
-                                    lambda x: isinstance(x, string_types), "is not a string")
-    params["goal"] = get_parameter(dictionary, "simulation", "goal",
-                                   lambda x: isinstance(x, string_types), "is not a string")
-    params["notes"] = get_parameter(dictionary, "simulation", "notes",
-                                    lambda x: isinstance(x, string_types), "is not a string")
-    params["duration"] = get_parameter(dictionary, "simulation", "duration",
-                                       lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0")
-    params["n"] = get_parameter(dictionary, "simulation", "number-motes",
-                                lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0")
-    params["repeat"] = get_parameter(dictionary, "simulation", "repeat",
-                                     lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0")
-    params["target"] = get_parameter(dictionary, "simulation", "target",
-                                     lambda x: x in get_available_platforms(), "is not a valid platform")
-    params["malicious_target"] = get_parameter(dictionary, "malicious", "target",
+    params["debug"] = get_parameter(simulation, "simulation", "debug",
+                                    lambda x: isinstance(x, bool), "is not a boolean", silent=silent)
+    params["title"] = get_parameter(simulation, "simulation", "title",
+                                    lambda x: isinstance(x, str), "is not a string", silent=silent)
+    params["goal"] = get_parameter(simulation, "simulation", "goal",
+                                   lambda x: isinstance(x, str), "is not a string", silent=silent)
+    params["notes"] = get_parameter(simulation, "simulation", "notes",
+                                    lambda x: isinstance(x, str), "is not a string", silent=silent)
+    params["duration"] = get_parameter(simulation, "simulation", "duration",
+                                       lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0",
+                                       silent=silent)
+    params["n"] = get_parameter(simulation, "simulation", "number-motes",
+                                lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0",
+                                silent=silent)
+    params["repeat"] = get_parameter(simulation, "simulation", "repeat",
+                                     lambda x: isinstance(x, int) and x > 0, "is not an integer greater than 0",
+                                     silent=silent)
+    params["target"] = get_parameter(simulation, "simulation", "target",
+                                     lambda x: x in get_available_platforms(), "is not a valid platform",
+                                     silent=silent)
+    params["malicious_target"] = get_parameter(malicious, "malicious", "target",
                                                lambda x: x in get_available_platforms(), "is not a valid platform",
-                                               default=params["target"])
-    params["mtype_root"] = "root-{}".format(get_parameter(dictionary, "simulation", "root",
+                                               default=params["target"], silent=silent)
+    params["mtype_root"] = "root-{}".format(get_parameter(simulation, "simulation", "root",
                                             lambda x: x in list_mote_types("root"),
-                                            "is not an available root mote type"))
-    params["mtype_sensor"] = "sensor-{}".format(get_parameter(dictionary, "simulation", "sensor",
+                                            "is not an available root mote type", silent=silent))
+    params["mtype_sensor"] = "sensor-{}".format(get_parameter(simulation, "simulation", "sensor",
                                                 lambda x: x in list_mote_types("sensor"),
-                                                "is not an available sensor mote type"))
-    params["mtype_malicious"] = "malicious-{}".format(get_parameter(dictionary, "malicious", "type",
+                                                "is not an available sensor mote type", silent=silent))
+    params["mtype_malicious"] = "malicious-{}".format(get_parameter(malicious, "malicious", "type",
                                                       lambda x: x in list_mote_types("malicious"),
-                                                      "is not an available malicious mote type"))
-    params["blocks"] = get_parameter(dictionary, "malicious", "building-blocks",
-                                     [lambda x: x in get_building_blocks()])
-    params["ext_lib"] = get_parameter(dictionary, "malicious", "external-library",
-                                      lambda x: x is None or exists(x), "does not exist")
-    params["wsn_gen_algo"] = get_parameter(dictionary, "simulation", "wsn-generation-algorithm",
-                                      lambda x: x in list_wsn_gen_algorithms(), "is not an available WSN generation algorithm")
+                                                      "is not an available malicious mote type", silent=silent))
+    params["blocks"] = get_parameter(malicious, "malicious", "building-blocks",
+                                     frozenset(get_building_blocks()), silent=silent)
+    params["ext_lib"] = get_parameter(malicious, "malicious", "external-library",
+                                      lambda x: x is None or exists(x), "does not exist", silent=silent)
+    params["wsn_gen_algo"] = get_parameter(simulation, "simulation", "wsn-generation-algorithm",
+                                      lambda x: x in list_wsn_gen_algorithms(),
+                                      "is not an available WSN generation algorithm", silent=silent)
     # area dimensions and limits
-    params["min_range"] = get_parameter(dictionary, "simulation", "minimum-distance-from-root",
+    params["min_range"] = get_parameter(simulation, "simulation", "minimum-distance-from-root",
                                         lambda x: isinstance(x, (int, float)) and x > 0,
-                                        "is not an integer greater than 0")
-    params["tx_range"] = get_parameter(dictionary, "simulation", "transmission-range",
+                                        "is not an integer greater than 0", silent=silent)
+    params["tx_range"] = get_parameter(simulation, "simulation", "transmission-range",
                                        lambda x: isinstance(x, (int, float)) and x > params["min_range"],
-                                       "is not an integer greater than {}".format(params["min_range"]))
-    params["int_range"] = get_parameter(dictionary, "simulation", "interference-range",
+                                       "is not an integer greater than {}".format(params["min_range"]),
+                                       silent=silent)
+    params["int_range"] = get_parameter(simulation, "simulation", "interference-range",
                                         lambda x: isinstance(x, (int, float)) and x >= params["tx_range"],
                                         "is not an integer greater than or equal to {}".format(params["tx_range"]),
-                                        default=2*params["tx_range"])
-    params["area_side"] = get_parameter(dictionary, "simulation", "area-square-side",
+                                        default=2*params["tx_range"], silent=silent)
+    params["area_side"] = get_parameter(simulation, "simulation", "area-square-side",
                                         lambda x: isinstance(x, (int, float)) and x >= sqrt(2.0) * params["min_range"],
                                         "is not an integer or a float greater or equal to sqrt(2)*{:.0f}"
-                                        .format(params["min_range"]))
-    params["max_range"] = get_parameter(dictionary, "simulation", "area-square-side",
+                                        .format(params["min_range"]), silent=silent)
+    params["max_range"] = get_parameter(simulation, "simulation", "area-square-side",
                                         lambda x: isinstance(x, (int, float)) and x >= params["min_range"],
                                         "is not an integer or a float greater or equal to {:.0f}"
-                                        .format(params["min_range"]))
+                                        .format(params["min_range"]), silent=silent)
     return params
 
 
+def __write_file(path, name, content):
+    """
+    This private function writes a rendered template to its destination through raw file descriptor
+     calls, avoiding the text-mode wrapper setup of open() for a single write.
+
+    :param path: folder where the file is to be written
+    :param name: destination file name
+    :param content: rendered template content
+    """
+    fd = os_open(join(path, name), O_WRONLY | O_CREAT | O_TRUNC, 0o644)
+    try:
+        write(fd, content.encode('utf-8'))
+    finally:
+        close(fd)
+
+
 def write_template(path, env, name, **kwargs):
     """
     This function fills in a template and copy it to its destination.
@@ -509,8 +609,9 @@ def write_template(path, env, name, **kwargs):
     :param env: template environment
     :param name: template's key in the templates dictionary
     :param kwargs: parameters associated to this template
+    :return: the rendered template content
     """
     logger.debug(" > Setting template file: {}".format(name))
-    template = env.get_template(name).render(**kwargs)
-    with open(join(path, name), "w") as f:
-        f.write(template)
+    content = env.get_template(name).render(**kwargs)
+    __write_file(path, name, content)
+    return content
@@ -2,11 +2,10 @@
 # -*- coding: utf-8 -*-
 import sh
 import unittest
-from jsmin import jsmin
-from json import loads
 from os.path import exists, expanduser, join
 
 from core.commands import drop, prepare
+from core.common.helpers import is_valid_commented_json
 from core.conf.constants import EXPERIMENT_FOLDER
 
 
@@ -29,13 +28,7 @@ class Test6Prepare(ExperimentTestCase):
 
     def test1_campaign_format(self):
         """ > Is the new experiment campaign a correct JSON file ? """
-        try:
-            with open(self.path) as f:
-                loads(jsmin(f.read()))
-            passed = True
-        except:
-            passed = False
-        self.assertTrue(passed)
+        self.assertTrue(is_valid_commented_json(self.path))
 
 
 class Test7Drop(ExperimentTestCase):